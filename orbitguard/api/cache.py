@@ -0,0 +1,58 @@
+"""
+In-process response cache for finished scan jobs.
+
+Purpose:
+- Once a ScanJob is SUCCEEDED or FAILED the worker never writes to it (or its risks) again,
+  so its risk list can't change
+- Its summary still can: events_in_window counts approach_events, which grows on every ingest
+  run, so summary keys also include the newest approach_events id
+- The UI keeps polling those endpoints, so the API keeps the already-encoded JSON bodies here
+  instead of re-running the count / list queries every time
+
+Keys include the job's updated_at, so if a job row is ever rewritten the old entry just stops
+matching (the worker and ingest run in separate processes and can't clear this cache directly).
+The cache holds at most `maxsize` bodies and `max_bytes` in total, dropping the least recently
+used ones when over either limit. Bodies larger than `max_entry_bytes` are never stored (the
+caller streams those instead), so one big risk list can't push everything else out.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Hashable
+
+from orbitguard.db.models import JobStatus
+
+TERMINAL_STATUSES = frozenset({JobStatus.SUCCEEDED.value, JobStatus.FAILED.value})
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        maxsize: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entry_bytes: int = 1024 * 1024,
+    ) -> None:
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._entries: OrderedDict[Hashable, bytes] = OrderedDict()
+        self._total_bytes = 0
+
+    def get(self, key: Hashable) -> bytes | None:
+        body = self._entries.get(key)
+        if body is not None:
+            self._entries.move_to_end(key)
+        return body
+
+    def put(self, key: Hashable, body: bytes) -> None:
+        if len(body) > self.max_entry_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._total_bytes -= len(old)
+        self._entries[key] = body
+        self._total_bytes += len(body)
+        while len(self._entries) > self.maxsize or self._total_bytes > self.max_bytes:
+            _, dropped = self._entries.popitem(last=False)
+            self._total_bytes -= len(dropped)
@@ -1,11 +1,8 @@
-from typing import Generator
-from sqlalchemy.orm import Session
-from orbitguard.db.database import SessionLocal
+from typing import AsyncGenerator
+from sqlalchemy.ext.asyncio import AsyncSession
+from orbitguard.db.database import AsyncSessionLocal
 
-def get_db() -> Generator[Session, None, None]:
-    db = SessionLocal()
-    try:
-        #yield lets fastapi borrow the session for the request, then always runs to close it.
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    #yield lets fastapi borrow the session for the request; the context manager always closes it.
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -11,19 +11,43 @@ What this file does:
   - list risk results produced by the worker
   - fetch stored explanations for a risk
   - return a summary for a scan job (counts of events scanned + risks found)
+
+Risk lists and summaries of finished jobs are cached in-process (see orbitguard/api/cache.py);
+summary entries also expire when ingest adds approach events.
 """
 
 
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import orjson
 from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from orbitguard.api.cache import ResponseCache, TERMINAL_STATUSES
 from orbitguard.api.deps import get_db
 from orbitguard.api.schemas import ScanCreate, ScanOut, RiskOut, ScanSummaryOut
+from orbitguard.db.database import async_engine
 from orbitguard.db.models import ScanJob, JobStatus, ApproachEvent, RiskEvent
 
 
-app = FastAPI(title="OrbitGuard")
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    yield
+    # close the pooled aiosqlite connections on shutdown instead of leaving them to GC
+    await async_engine.dispose()
+
+
+app = FastAPI(title="OrbitGuard", lifespan=lifespan)
+
+# rows fetched per round-trip when streaming /risks
+RISKS_BATCH_SIZE = 1000
+
+# encoded /risks?job_id=... and /scans/{job_id}/summary bodies for finished jobs
+response_cache = ResponseCache(maxsize=256)
 
 # Allow the browser UI (ui/index.html served on a simple local server) to call the API
 app.add_middleware(
@@ -37,13 +61,13 @@ app.add_middleware(
 
 # Endpoint to check whether the server is alive
 @app.get("/health")
-def health():
+async def health():
     return {"status": "ok"}
 
 
 # Create a scan job (does NOT run it immediately)
 @app.post("/scans", response_model=ScanOut)
-def create_scan(scan: ScanCreate, db: Session = Depends(get_db)):
+async def create_scan(scan: ScanCreate, db: AsyncSession = Depends(get_db)):
     # basic validation (business rules)
     if scan.end_ts <= scan.start_ts:
         raise HTTPException(status_code=400, detail="end_ts must be greater than start_ts")
@@ -55,101 +79,156 @@ def create_scan(scan: ScanCreate, db: Session = Depends(get_db)):
         status=JobStatus.PENDING.value,
     )
 
+    # no refresh: the flush fills in the id and the column defaults (attempts, max_attempts, ...)
+    # on the object, and expire_on_commit=False keeps them loaded after the commit
     db.add(job)
-    db.commit()
-    db.refresh(job)
+    await db.commit()
 
-    return ScanOut(
-        id=job.id,
-        start_ts=job.start_ts,
-        end_ts=job.end_ts,
-        threshold_km=job.threshold_km,
-        status=job.status,
-        attempts=job.attempts,
-        max_attempts=job.max_attempts,
-        error=job.error,
-    )
+    return ScanOut.model_validate(job)
 
 
 # Get scan job status/details
-@app.get("/scans/{job_id}", response_model=ScanOut)
-def get_scan(job_id: int, db: Session = Depends(get_db)):
-    job = db.query(ScanJob).filter(ScanJob.id == job_id).first()
+# Polled by the UI, so it returns a plain dict (ScanOut shape) and skips the
+# response_model re-validation pass.
+@app.get("/scans/{job_id}", response_class=ORJSONResponse, responses={200: {"model": ScanOut}})
+async def get_scan(job_id: int, db: AsyncSession = Depends(get_db)):
+    job = await db.get(ScanJob, job_id)
     if job is None:
         raise HTTPException(status_code=404, detail="Scan job not found")
 
-    return ScanOut(
-        id=job.id,
-        start_ts=job.start_ts,
-        end_ts=job.end_ts,
-        threshold_km=job.threshold_km,
-        status=job.status,
-        attempts=job.attempts,
-        max_attempts=job.max_attempts,
-        error=job.error,
-    )
+    return {
+        "id": job.id,
+        "start_ts": job.start_ts,
+        "end_ts": job.end_ts,
+        "threshold_km": job.threshold_km,
+        "status": job.status,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "error": job.error,
+    }
 
 
 # List risks (optionally filtered to a specific job)
-@app.get("/risks", response_model=list[RiskOut])
-def list_risks(job_id: int | None = None, db: Session = Depends(get_db)):
-    q = db.query(RiskEvent)
+# Rows are read as plain column tuples in batches of RISKS_BATCH_SIZE and streamed out as a
+# JSON array with orjson, so a large job never has the whole result set in memory at once.
+# For a finished job the streamed body is also kept in response_cache if it stays under
+# response_cache.max_entry_bytes, and served from there after that.
+@app.get("/risks", responses={200: {"model": list[RiskOut]}})
+async def list_risks(job_id: int | None = None, db: AsyncSession = Depends(get_db)):
+    cache_key = None
+    if job_id is not None:
+        job = await db.get(ScanJob, job_id)
+        if job is not None and job.status in TERMINAL_STATUSES:
+            cache_key = ("risks", job.id, job.updated_at)
+            body = response_cache.get(cache_key)
+            if body is not None:
+                return Response(body, media_type="application/json")
+
+    q = select(
+        RiskEvent.id,
+        RiskEvent.job_id,
+        RiskEvent.object_id,
+        RiskEvent.min_distance_km,
+        RiskEvent.tca_ts,
+        RiskEvent.risk_score,
+    )
     if job_id is not None:
-        q = q.filter(RiskEvent.job_id == job_id)
+        q = q.where(RiskEvent.job_id == job_id)
 
-    risks = q.order_by(RiskEvent.risk_score.desc()).all()
+    result = await db.stream(
+        q.order_by(RiskEvent.risk_score.desc()).execution_options(yield_per=RISKS_BATCH_SIZE)
+    )
 
-    return [
-        RiskOut(
-            id=r.id,
-            job_id=r.job_id,
-            object_id=r.object_id,
-            min_distance_km=r.min_distance_km,
-            tca_ts=r.tca_ts,
-            risk_score=r.risk_score,
-        )
-        for r in risks
-    ]
+    body_chunks = _risk_rows_json(result)
+    if cache_key is not None:
+        body_chunks = _cache_small_body(body_chunks, cache_key)
+
+    return StreamingResponse(body_chunks, media_type="application/json")
+
+
+async def _risk_rows_json(result) -> AsyncIterator[bytes]:
+    yield b"["
+    first = True
+    # mappings() gives dict-like rows keyed by column name, straight from the cursor
+    async for batch in result.mappings().partitions():
+        chunk = b",".join(orjson.dumps(dict(r)) for r in batch)
+        yield chunk if first else b"," + chunk
+        first = False
+    yield b"]"
+
+
+async def _cache_small_body(chunks: AsyncIterator[bytes], cache_key) -> AsyncIterator[bytes]:
+    # passes the chunks through, keeping a copy until it grows past max_entry_bytes;
+    # only a body that was sent in full and stayed small is cached
+    kept: list[bytes] | None = []
+    size = 0
+    async for chunk in chunks:
+        if kept is not None:
+            size += len(chunk)
+            if size > response_cache.max_entry_bytes:
+                kept = None
+            else:
+                kept.append(chunk)
+        yield chunk
+    if kept is not None:
+        response_cache.put(cache_key, b"".join(kept))
 
 
 # Explain a specific risk (returns stored explanation)
+# Read-only, so it selects the columns as a row mapping instead of loading a RiskEvent
 @app.get("/risks/{risk_id}/explain")
-def explain_risk(risk_id: int, db: Session = Depends(get_db)):
-    risk = db.query(RiskEvent).filter(RiskEvent.id == risk_id).first()
-    if risk is None:
+async def explain_risk(risk_id: int, db: AsyncSession = Depends(get_db)):
+    q = select(
+        RiskEvent.id.label("risk_id"),
+        RiskEvent.object_id,
+        RiskEvent.min_distance_km,
+        RiskEvent.tca_ts,
+        RiskEvent.risk_score,
+        RiskEvent.explanation_json,
+    ).where(RiskEvent.id == risk_id)
+
+    row = (await db.execute(q)).mappings().first()
+    if row is None:
         raise HTTPException(status_code=404, detail="Risk not found")
 
-    return {
-        "risk_id": risk.id,
-        "object_id": risk.object_id,
-        "min_distance_km": risk.min_distance_km,
-        "tca_ts": risk.tca_ts,
-        "risk_score": risk.risk_score,
-        "explanation_json": risk.explanation_json,
-    }
+    return Response(orjson.dumps(dict(row)), media_type="application/json")
 
 
 # Scan summary (no alerts)
 @app.get("/scans/{job_id}/summary", response_model=ScanSummaryOut)
-def scan_summary(job_id: int, db: Session = Depends(get_db)):
-    job = db.query(ScanJob).filter(ScanJob.id == job_id).first()
+async def scan_summary(job_id: int, db: AsyncSession = Depends(get_db)):
+    job = await db.get(ScanJob, job_id)
     if job is None:
         raise HTTPException(status_code=404, detail="Scan job not found")
 
-    events_in_window = (
-        db.query(ApproachEvent)
-        .filter(ApproachEvent.approach_ts >= job.start_ts)
-        .filter(ApproachEvent.approach_ts <= job.end_ts)
-        .count()
+    cache_key = None
+    if job.status in TERMINAL_STATUSES:
+        # events_in_window counts approach_events, which every ingest run appends to, so the
+        # key also carries the newest approach_events id (a primary-key lookup, no count)
+        last_event_id = await db.scalar(select(func.max(ApproachEvent.id)))
+        cache_key = ("summary", job.id, job.updated_at, last_event_id)
+        body = response_cache.get(cache_key)
+        if body is not None:
+            return Response(body, media_type="application/json")
+
+    # Both counts come back from one statement (two scalar subqueries)
+    events_q = (
+        select(func.count())
+        .select_from(ApproachEvent)
+        .where(ApproachEvent.approach_ts >= job.start_ts)
+        .where(ApproachEvent.approach_ts <= job.end_ts)
     )
-
-    risks_found = (
-        db.query(RiskEvent)
-        .filter(RiskEvent.job_id == job.id)
-        .count()
+    risks_q = (
+        select(func.count())
+        .select_from(RiskEvent)
+        .where(RiskEvent.job_id == job.id)
     )
 
-    return ScanSummaryOut(
+    events_in_window, risks_found = (
+        await db.execute(select(events_q.scalar_subquery(), risks_q.scalar_subquery()))
+    ).one()
+
+    summary = ScanSummaryOut(
         job_id=job.id,
         status=job.status,
         window_start_ts=job.start_ts,
@@ -157,4 +236,9 @@ def scan_summary(job_id: int, db: Session = Depends(get_db)):
         threshold_km=job.threshold_km,
         events_in_window=events_in_window,
         risks_found=risks_found,
-    )
\ No newline at end of file
+    )
+
+    if cache_key is not None:
+        response_cache.put(cache_key, summary.model_dump_json().encode())
+
+    return summary
\ No newline at end of file
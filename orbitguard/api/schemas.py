@@ -8,24 +8,26 @@
  --- scanout defines the shape of the response and it will always return in same structure
 '''
 
+from typing import Annotated
 from pydantic import BaseModel, Field
 from orbitguard.api.time_utils import to_unix_seconds
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, BeforeValidator, ConfigDict
 from datetime import datetime
 
+# Users can send int unix seconds OR ISO strings OR datetimes; the before-validator
+# normalizes all of them to unix seconds, so the field itself is a plain int
+UnixTs = Annotated[int, BeforeValidator(to_unix_seconds, json_schema_input_type=int | str | datetime)]
+
 class ScanCreate(BaseModel):
-    # Users can send int unix seconds OR ISO strings OR datetimes
-    start_ts: int | str | datetime
-    end_ts: int | str | datetime
+    start_ts: UnixTs
+    end_ts: UnixTs
     threshold_km: float
 
-    @field_validator("start_ts", "end_ts", mode="before")
-    @classmethod
-    def _parse_ts(cls, v):
-        return to_unix_seconds(v)
-
 
 class ScanOut(BaseModel):
+    # lets ScanOut.model_validate(job) read straight off the ORM object
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     start_ts: int
     end_ts: int
@@ -36,6 +38,8 @@ class ScanOut(BaseModel):
     error: str | None
 
 class RiskOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     job_id: int
     object_id: str
@@ -7,10 +7,12 @@ Purpose:
 - This function normalizes those inputs into unix seconds
 
 What it accepts:
-- int: treated as already-unix seconds and returned unchanged
+- int / float: treated as already-unix seconds (floats truncated to whole seconds, bools rejected)
 - datetime: converted to UTC (assumes UTC if timezone-naive)
 - str:
-  - if it's all digits, treated as a unix timestamp
+  - if it is all ASCII digits, treated as a unix timestamp
+  - 'YYYY-MM-DDTHH:MM:SSZ' and 'YYYY-MM-DDTHH:MM:SS.sssZ' (what the UI sends) take a
+    fast path that skips datetime entirely
   - otherwise parsed as ISO 8601 (supports 'Z' suffix like 2026-01-15T12:00:00Z)
 
 What it returns:
@@ -21,19 +23,99 @@ If the input type isn't supported, it raises ValueError.
 
 from __future__ import annotations
 
+import calendar
+import math
+import numbers
+import re
 from datetime import datetime, timezone
+from functools import lru_cache
+
+
+# 'YYYY-MM-DDTHH:MM:SSZ' / 'YYYY-MM-DDTHH:MM:SS.sssZ'; re.ASCII keeps \d to 0-9, so signs,
+# spaces and non-ASCII digits don't match and are left to fromisoformat to reject
+_ISO_UTC_Z_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.(\d{3}))?Z", re.ASCII)
+
+
+def _parse_iso_utc_z(s: str) -> int | None:
+    """
+    Parses exactly 'YYYY-MM-DDTHH:MM:SSZ' or 'YYYY-MM-DDTHH:MM:SS.sssZ' and hands the
+    fields to calendar.timegm (no datetime objects are created). Returns None if the
+    string is not in that shape or a field is out of range, so the caller can fall back
+    to fromisoformat.
+    """
+    m = _ISO_UTC_Z_RE.fullmatch(s)
+    if m is None:
+        return None
+
+    y, mo, d, h, mi, sec = (int(g) for g in m.group(1, 2, 3, 4, 5, 6))
+    millis = m.group(7)
+    has_millis = millis is not None and millis != "000"
+
+    if not (y >= 1 and 1 <= mo <= 12 and 0 <= h < 24 and 0 <= mi < 60 and 0 <= sec < 60):
+        return None
+    if not 1 <= d <= calendar.monthrange(y, mo)[1]:
+        return None
+
+    ts = calendar.timegm((y, mo, d, h, mi, sec, 0, 0, 0))
+    # match int(dt.timestamp()), which truncates fractional seconds toward zero
+    if has_millis and ts < 0:
+        ts += 1
+    return ts
+
+
+# longest string worth memoizing; ISO / unix-second strings are well under this
+_MAX_CACHED_LEN = 64
+
+
+def _parse_time_str(s: str) -> int:
+    """
+    String branch of to_unix_seconds, for an already-stripped string.
+    """
+    # unix seconds sent as a string: plain ASCII digits only (int() alone would also take
+    # '+5', '-5' and '1_000')
+    if s.isascii() and s.isdigit():
+        return int(s)
+
+    if s.endswith("Z"):
+        ts = _parse_iso_utc_z(s)
+        if ts is not None:
+            return ts
+
+    s = s.replace("Z", "+00:00")
+
+    dt = datetime.fromisoformat(s)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    else:
+        dt = dt.astimezone(timezone.utc)
+    return int(dt.timestamp())
+
+
+# memoized on the stripped string since the UI re-sends the same start/end values when
+# polling or retrying; to_unix_seconds only sends strings up to _MAX_CACHED_LEN here, so
+# padded or oversized input can't pin memory in the cache
+_str_to_unix_seconds = lru_cache(maxsize=4096)(_parse_time_str)
+
 
 def to_unix_seconds(value) -> int:
     """
     Accepts:
-      - int (already unix seconds)
+      - int / float (already unix seconds; floats are truncated, bools are rejected)
       - str (ISO like '2026-01-15T12:00:00Z' or unix as '1766638719')
       - datetime
     Returns:
       - unix timestamp (int seconds, UTC)
     """
-    if isinstance(value, int):
-        return value
+    # numbers first (the common case): ints incl. numpy ints, and floats like time.time().
+    # bool is an int subclass but never a meaningful timestamp.
+    if isinstance(value, bool):
+        raise ValueError(f"Unsupported time value: {value!r}")
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            raise ValueError(f"Unsupported time value: {value!r}")
+        return int(value)
 
     if isinstance(value, datetime):
         dt = value
@@ -45,16 +127,8 @@ def to_unix_seconds(value) -> int:
 
     if isinstance(value, str):
         s = value.strip()
-        if s.isdigit():
-            return int(s)
-
-        s = s.replace("Z", "+00:00")
-
-        dt = datetime.fromisoformat(s)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        else:
-            dt = dt.astimezone(timezone.utc)
-        return int(dt.timestamp())
+        if len(s) <= _MAX_CACHED_LEN:
+            return _str_to_unix_seconds(s)
+        return _parse_time_str(s)
 
     raise ValueError(f"Unsupported time value: {value!r}")
@@ -4,6 +4,11 @@ If OrbitGuard were to be upgraded to store each object's position and velocity a
 objects table within the database, then this program would be of use. The worker would compute the 
 closest approach within a time window using those vectors, rather than relying on NASA CAD API 
 events.
+
+closest_approach_batch is the NumPy version of the same math for a whole catalog at once
+(positions/velocities as (N, 3) arrays). It needs numpy, which is not in requirements.txt
+yet since nothing calls this file, so numpy is imported inside that function only and the
+scalar functions still work without it.
 '''
 
 from __future__ import annotations
@@ -68,14 +73,14 @@ def closest_approach_constant_velocity(
         r1x = rx + vx * dt1
         r1y = ry + vy * dt1
         r1z = rz + vz * dt1
-        d1 = math.sqrt(r1x*r1x + r1y*r1y + r1z*r1z)
+        d1 = math.hypot(r1x, r1y, r1z)
 
         # Distance at the end of the window
         dt2 = t2 - t0
         r2x = rx + vx * dt2
         r2y = ry + vy * dt2
         r2z = rz + vz * dt2
-        d2 = math.sqrt(r2x*r2x + r2y*r2y + r2z*r2z)
+        d2 = math.hypot(r2x, r2y, r2z)
 
         # Pick whichever endpoint is closer
         if d1 <= d2:
@@ -105,8 +110,55 @@ def closest_approach_constant_velocity(
     cy = ry + vy * dt
     cz = rz + vz * dt
 
-    # euclidean distance from origin 
-    dmin = math.sqrt(cx*cx + cy*cy + cz*cz)
+    # euclidean distance from origin (hypot = sqrt of sum of squares in one C call)
+    dmin = math.hypot(cx, cy, cz)
 
     # Return integer timestamp and min distance
-    return int(round(t_star)), dmin
\ No newline at end of file
+    return int(round(t_star)), dmin
+
+
+def closest_approach_batch(
+    epoch_ts: np.ndarray,
+    r_km: np.ndarray,
+    v_km_s: np.ndarray,
+    start_ts: int,
+    end_ts: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Same model as closest_approach_constant_velocity, computed for N objects
+    in one pass instead of one Python call per object.
+
+    Inputs:
+      epoch_ts: (N,) epoch per object (or a single shared epoch)
+      r_km:     (N, 3) positions at epoch
+      v_km_s:   (N, 3) velocities
+
+    Returns:
+      (tca_ts[N] as int64, min_distance_km[N] as float64)
+    """
+    # imported here so the scalar functions above work without numpy installed
+    import numpy as np
+
+    t1 = float(start_ts)
+    t2 = float(end_ts)
+    t0 = np.asarray(epoch_ts, dtype=np.float64)
+    r = np.asarray(r_km, dtype=np.float64)
+    v = np.asarray(v_km_s, dtype=np.float64)
+
+    # per-row dot products v·v and r0·v
+    v2 = np.einsum("ij,ij->i", v, v)
+    rv = np.einsum("ij,ij->i", r, v)
+
+    # t* = t0 - (r0·v)/(v·v), clamped to the window.
+    # Objects with v == 0 sit still, so every time is equally close; like the
+    # scalar version we report the start of the window for them.
+    moving = v2 > 0.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_star = np.where(moving, t0 - rv / v2, t1)
+    t_star = np.clip(t_star, t1, t2)
+
+    # position at t* and its distance from the origin
+    dp = r + v * (t_star - t0)[:, None]
+    dmin = np.linalg.norm(dp, axis=1)
+
+    return np.rint(t_star).astype(np.int64), dmin
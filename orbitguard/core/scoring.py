@@ -6,11 +6,23 @@
 
 - Build Explanation JSON: 
 -- builds a JSON string that stores the inputs and outputs of a scan result. Is stored in SQLite
+-- encoded with orjson when installed (compact + key-sorted, same JSON values as the json.dumps fallback)
+
+- Score and Serialize:
+-- the worker's per-hit path: computes the risk score and fills the same explanation JSON into a
+   fixed template (keys pre-sorted), so no dict is built and no keys are sorted per call
+-- the only string field (object_id) is escaped with the same encoder build_explanation_json uses
 '''
 
 
 from __future__ import annotations
 import json
+import math
+
+try:
+    import orjson
+except ImportError:  # worker/ingest can run without the api extras installed
+    orjson = None
 
 
 def risk_score(threshold_km: float, min_distance_km: float) -> float:
@@ -32,13 +44,72 @@ def build_explanation_json(
     """
     stored as JSON text (easy for SQLite).
     """
+    # keys are written in sorted order (dicts keep insertion order), so the
+    # output is key-sorted without asking the encoder to sort on every call
     payload = {
-        "object_id": object_id,
-        "window": {"start_ts": start_ts, "end_ts": end_ts},
+        "closest_approach": {"min_distance_km": min_distance_km, "tca_ts": tca_ts},
         "epoch_ts": epoch_ts,
-        "closest_approach": {"tca_ts": tca_ts, "min_distance_km": min_distance_km},
-        "threshold_km": threshold_km,
+        "object_id": object_id,
         "risk_score": score,
+        "threshold_km": threshold_km,
         "why_flagged": min_distance_km <= threshold_km,
+        "window": {"end_ts": end_ts, "start_ts": start_ts},
     }
-    return json.dumps(payload, separators=(",", ":"), sort_keys=True)
+    if orjson is not None:
+        return orjson.dumps(payload).decode()
+    return json.dumps(payload, separators=(",", ":"))
+
+
+def _json_str(value: str) -> str:
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value)
+
+
+# build_explanation_json's output with the keys already in sorted order
+_EXPLANATION_TEMPLATE = (
+    '{"closest_approach":{"min_distance_km":%r,"tca_ts":%d},"epoch_ts":%d,'
+    '"object_id":%s,"risk_score":%r,"threshold_km":%r,"why_flagged":%s,'
+    '"window":{"end_ts":%d,"start_ts":%d}}'
+)
+
+def score_and_serialize(
+    threshold_km: float,
+    min_distance_km: float,
+    object_id: str,
+    epoch_ts: int,
+    start_ts: int,
+    end_ts: int,
+    tca_ts: int,
+) -> tuple[float, str]:
+    """
+    risk_score + build_explanation_json in one call, returns (score, explanation JSON text).
+    Floats are written with repr (what json.dumps uses); non-finite values can't go in the
+    template as valid JSON, so those fall back to build_explanation_json.
+    """
+    score = risk_score(threshold_km, min_distance_km)
+
+    if not (math.isfinite(min_distance_km) and math.isfinite(threshold_km)):
+        return score, build_explanation_json(
+            object_id=object_id,
+            epoch_ts=epoch_ts,
+            start_ts=start_ts,
+            end_ts=end_ts,
+            threshold_km=threshold_km,
+            tca_ts=tca_ts,
+            min_distance_km=min_distance_km,
+            score=score,
+        )
+
+    expl = _EXPLANATION_TEMPLATE % (
+        min_distance_km,
+        tca_ts,
+        epoch_ts,
+        _json_str(object_id),
+        score,
+        threshold_km,
+        "true" if min_distance_km <= threshold_km else "false",
+        end_ts,
+        start_ts,
+    )
+    return score, expl
@@ -1,17 +1,53 @@
 '''
 This file creates: 
--- a single engine (the connection to sqlite file)
--- a sessionlocal factory (so api and worker can talk to db)
+-- a sync engine (the connection to sqlite file) + sessionlocal factory, used by the worker and ingest scripts
+-- an async engine + asyncsessionlocal factory over the same file, used by the api so
+   requests wait on the db without holding a threadpool thread
+-- sqlite pragmas applied to every new connection of both engines (WAL journal, etc.)
 '''
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 DB_URL = "sqlite:///./orbitguard.db" 
+ASYNC_DB_URL = "sqlite+aiosqlite:///./orbitguard.db"
 
+# query_cache_size: compiled-SQL cache entries per engine (default 500); statements are
+# built with select() so repeated queries hit this cache instead of re-compiling
 engine = create_engine(
     DB_URL,
     connect_args={"check_same_thread": False},
+    query_cache_size=1200,
 )
 
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+# expire_on_commit=False: the worker keeps using job attributes after each commit; nothing else
+# writes those rows mid-job, so re-SELECTing them after every commit is wasted round-trips
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+
+async_engine = create_async_engine(
+    ASYNC_DB_URL,
+    pool_size=20,
+    max_overflow=40,
+    query_cache_size=1200,
+)
+
+
+def _set_sqlite_pragmas(dbapi_conn, _connection_record) -> None:
+    # WAL lets the api keep reading while the worker/ingest write, and commits append to the
+    # log instead of rewriting a rollback journal. synchronous=NORMAL only fsyncs at checkpoints
+    # (a power cut can drop the last commits, but can't corrupt the file).
+    cur = dbapi_conn.cursor()
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute("PRAGMA synchronous=NORMAL")
+    cur.execute("PRAGMA temp_store=MEMORY")
+    cur.execute("PRAGMA mmap_size=268435456")
+    cur.execute("PRAGMA cache_size=-65536")  # negative = KiB, i.e. 64 MB page cache per connection
+    cur.close()
+
+
+event.listen(engine, "connect", _set_sqlite_pragmas)
+event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+
+# expire_on_commit=False: async sessions can't lazy-load expired attributes after commit
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
@@ -6,6 +6,11 @@ from orbitguard.db.models import Base
 
 def init_db() -> None:
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist, so indexes added to the
+    # models later still need to be created on an existing orbitguard.db
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
 
 if __name__ == "__main__":
     init_db()
@@ -27,8 +27,10 @@ from sqlalchemy import (
     Float,
     DateTime,
     ForeignKey,
+    Index,
     Text,
     UniqueConstraint,
+    text,
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
@@ -68,6 +70,10 @@ class Object(Base):
 
 class ScanJob(Base):
     __tablename__ = "scan_jobs"
+    __table_args__ = (
+        # claim_next_job: WHERE status = 'PENDING' ORDER BY created_at LIMIT 1
+        Index("ix_scan_jobs_status_created_at", "status", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
@@ -75,7 +81,7 @@ class ScanJob(Base):
     end_ts: Mapped[int] = mapped_column(Integer, index=True)
     threshold_km: Mapped[float] = mapped_column(Float)
 
-    status: Mapped[str] = mapped_column(String, default=JobStatus.PENDING.value, index=True)
+    status: Mapped[str] = mapped_column(String, default=JobStatus.PENDING.value)
     attempts: Mapped[int] = mapped_column(Integer, default=0)
     max_attempts: Mapped[int] = mapped_column(Integer, default=3)
 
@@ -89,10 +95,15 @@ class ScanJob(Base):
 
 class RiskEvent(Base):
     __tablename__ = "risk_events"
+    __table_args__ = (
+        # /risks?job_id=... filters by job and orders by score
+        Index("ix_risk_job_score", "job_id", text("risk_score DESC")),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
-    job_id: Mapped[int] = mapped_column(ForeignKey("scan_jobs.id"), index=True)
+    # no standalone index: ix_risk_job_score (job_id, risk_score) covers job_id lookups
+    job_id: Mapped[int] = mapped_column(ForeignKey("scan_jobs.id"))
     object_id: Mapped[str] = mapped_column(String, index=True)  # keep simple for MVP
 
     min_distance_km: Mapped[float] = mapped_column(Float)
@@ -106,6 +117,10 @@ class RiskEvent(Base):
 #Data ingested from NASA API propagated into database
 class ApproachEvent(Base):
     __tablename__ = "approach_events"
+    __table_args__ = (
+        # the worker's scan: approach_ts in the job window AND miss_distance_km <= threshold
+        Index("ix_approach_ts_dmin", "approach_ts", "miss_distance_km"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
@@ -114,7 +129,8 @@ class ApproachEvent(Base):
     name: Mapped[str | None] = mapped_column(String, nullable=True)
 
     # Approach time (CAD field: cd converted to unix seconds)
-    approach_ts: Mapped[int] = mapped_column(Integer, index=True)
+    # no standalone index: ix_approach_ts_dmin (approach_ts, miss_distance_km) covers it
+    approach_ts: Mapped[int] = mapped_column(Integer)
 
     # Miss distance in km (CAD field: dist in AU -> km)
     miss_distance_km: Mapped[float] = mapped_column(Float, index=True)
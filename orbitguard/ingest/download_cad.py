@@ -1,6 +1,6 @@
 """
 Downloads close-approach data from NASA/JPL CAD API and saves the following: 
-- data/raw/cad.json
+- data/raw/cad.json - (the API response bytes exactly as received, streamed to disk)
 - data/raw/cad.csv - (CSV version for db readings)
 
 CAD records contain fields like:
@@ -12,6 +12,9 @@ from __future__ import annotations
 
 import csv
 import json
+import os
+import shutil
+import tempfile
 from pathlib import Path
 from urllib.parse import urlencode
 from urllib.request import urlopen, Request
@@ -31,7 +34,13 @@ def download_cad_json(
     date_max: str = "+365",     
     body: str = "Earth",
     sort: str = "date",
+    json_path: Path = JSON_PATH,
 ) -> dict:
+    """
+    Streams the raw response into a temp file next to json_path (no decode / re-encode of
+    the body in memory), parses it once, and only then moves it onto json_path, so a
+    dropped connection or non-JSON error body leaves the last good cad.json in place.
+    """
     params = {
         "dist-max": dist_max,
         "date-min": date_min,
@@ -44,8 +53,22 @@ def download_cad_json(
 
 
     req = Request(url, headers={"User-Agent": "OrbitGuard/0.1 (edu project)"})
-    with urlopen(req) as resp:
-        payload = json.loads(resp.read().decode("utf-8"))
+    fd, tmp_name = tempfile.mkstemp(dir=json_path.parent, suffix=".part")
+    try:
+        with os.fdopen(fd, "w+b") as f:
+            with urlopen(req) as resp:
+                shutil.copyfileobj(resp, f)
+            f.seek(0)
+            payload = json.load(f)
+        # mkstemp makes the file owner-only (0600); give it the permissions a normally
+        # created file would get (0666 minus the umask) before it becomes cad.json
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_name, 0o666 & ~umask)
+        os.replace(tmp_name, json_path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
     return payload
 
 
@@ -67,11 +90,9 @@ def write_csv_from_payload(payload: dict, csv_path: Path) -> None:
 
 
 def main() -> None:
+    #downloads and saves raw JSON
     payload = download_cad_json()
 
-    #save raw JSON
-    JSON_PATH.write_text(json.dumps(payload, indent=2), encoding="utf-8")
-
     #save CSV
     write_csv_from_payload(payload, CSV_PATH)
 
@@ -13,7 +13,8 @@ What this script does:
 - Reads data/raw/cad.csv (produced by download_cad.py)
 - Parses the CAD "cd" time into unix time
 - Converts miss distance from AU to km
-- Inserts each row as an ApproachEvent in the database
+- Inserts the rows as ApproachEvents in batches (one executemany per BATCH_SIZE rows),
+  all inside a single transaction
 
 Why we store ApproachEvent (not full orbits):
 - OrbitGuard's MVP is an evaluation engine, not an orbit propagator
@@ -24,9 +25,10 @@ Why we store ApproachEvent (not full orbits):
 from __future__ import annotations
 
 import csv
+from itertools import islice
 from pathlib import Path
 
-from orbitguard.db.database import SessionLocal
+from orbitguard.db.database import engine
 from orbitguard.db.models import ApproachEvent
 from orbitguard.ingest.parse_time import parse_cd_to_unix_seconds
 
@@ -35,6 +37,12 @@ AU_TO_KM = 149_597_870.7
 REPO_ROOT = Path(__file__).resolve().parents[2]
 RAW_CSV = REPO_ROOT / "data" / "raw" / "cad.csv"
 
+# CSV rows parsed and inserted per executemany
+BATCH_SIZE = 10_000
+
+# every row comes from the same source, so it is bound once on the INSERT instead of per row
+SOURCE = "NASA_JPL_CAD"
+
 
 def main() -> None:
     if not RAW_CSV.exists():
@@ -43,41 +51,67 @@ def main() -> None:
     inserted = 0
     skipped = 0
 
-    db = SessionLocal()
-    try:
+    # Core INSERT with a list of dicts = one executemany per batch (no ORM objects per row)
+    insert_stmt = ApproachEvent.__table__.insert().values(source=SOURCE)
+
+    # one shared str per distinct designation/name (an object has many close approaches,
+    # so the same strings repeat across rows)
+    interned: dict[str, str] = {}
+
+    # write-only, so no ORM session: one connection + one transaction for the whole file
+    # (committed when the block exits, rolled back if any row fails)
+    with engine.begin() as conn:
         with RAW_CSV.open("r", newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-
-            for row in reader:
-                des = (row.get("des") or "").strip()
-                cd = (row.get("cd") or "").strip()
-                dist_au = row.get("dist")
-                v_rel = row.get("v_rel")
-
-                if not des or not cd or dist_au is None or v_rel is None:
-                    skipped += 1
-                    continue
-
-                approach_ts = parse_cd_to_unix_seconds(cd)
-                miss_distance_km = float(dist_au) * AU_TO_KM
-                v_rel_km_s = float(v_rel)
-
-                event = ApproachEvent(
-                    object_id=des,
-                    name=row.get("fullname") or des,
-                    approach_ts=approach_ts,
-                    miss_distance_km=miss_distance_km,
-                    v_rel_km_s=v_rel_km_s,
-                    source="NASA_JPL_CAD",
-                )
-                db.add(event)
-                inserted += 1
-
-        db.commit()
-        print(f"✅ Ingested CAD events. Inserted={inserted}, Skipped={skipped}")
-
-    finally:
-        db.close()
+            # plain lists per row; column positions are looked up once from the header
+            reader = csv.reader(f)
+            header = next(reader, [])
+            col = {name: i for i, name in enumerate(header)}
+
+            missing = [name for name in ("des", "cd", "dist", "v_rel") if name not in col]
+            if missing:
+                raise ValueError(f"{RAW_CSV} is missing CAD columns: {', '.join(missing)}")
+
+            i_des, i_cd, i_dist, i_vrel = col["des"], col["cd"], col["dist"], col["v_rel"]
+            i_full = col.get("fullname")  # only present when CAD is asked for fullname=true
+            min_len = max(i_des, i_cd, i_dist, i_vrel) + 1
+
+            while True:
+                chunk = list(islice(reader, BATCH_SIZE))
+                if not chunk:
+                    break
+
+                rows = []
+                for row in chunk:
+                    if len(row) < min_len:
+                        skipped += 1
+                        continue
+
+                    des = row[i_des].strip()
+                    cd = row[i_cd].strip()
+                    if not des or not cd:
+                        skipped += 1
+                        continue
+
+                    fullname = row[i_full] if i_full is not None and i_full < len(row) else ""
+
+                    des = interned.setdefault(des, des)
+                    name = interned.setdefault(fullname, fullname) if fullname else des
+
+                    rows.append(
+                        {
+                            "object_id": des,
+                            "name": name,
+                            "approach_ts": parse_cd_to_unix_seconds(cd),
+                            "miss_distance_km": float(row[i_dist]) * AU_TO_KM,
+                            "v_rel_km_s": float(row[i_vrel]),
+                        }
+                    )
+
+                if rows:
+                    conn.execute(insert_stmt, rows)
+                    inserted += len(rows)
+
+    print(f"✅ Ingested CAD events. Inserted={inserted}, Skipped={skipped}")
 
 
 if __name__ == "__main__":
@@ -15,6 +15,8 @@ Why this is needed:
 
 from __future__ import annotations
 
+import calendar
+import re
 from datetime import datetime, timezone
 
 # CAD "cd" format must be converted to compute for our model
@@ -26,8 +28,43 @@ FORMATS = [
     "%Y-%m-%d %H:%M:%S",
 ]
 
+# Fast path for the first two FORMATS (what CAD actually returns, e.g. "2025-Nov-23 18:00"):
+# a regex match + calendar.timegm, no strptime and no datetime objects
+_CD_RE = re.compile(r"^(\d{4})-([A-Z][a-z]{2})-(\d{2}) (\d{2}):(\d{2})(?::(\d{2}))?$")
+_MONTHS = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12,
+}
+
+
+def _parse_cd_fast(cd: str) -> int | None:
+    # returns None when cd isn't in the "YYYY-Mon-DD HH:MM[:SS]" shape (or a field is
+    # out of range) so the caller falls back to the strptime loop
+    m = _CD_RE.match(cd)
+    if m is None:
+        return None
+
+    mo = _MONTHS.get(m.group(2))
+    if mo is None:
+        return None
+
+    y = int(m.group(1))
+    d = int(m.group(3))
+    h = int(m.group(4))
+    mi = int(m.group(5))
+    sec = int(m.group(6) or 0)
+    if not (y >= 1 and h < 24 and mi < 60 and sec < 60 and 1 <= d <= calendar.monthrange(y, mo)[1]):
+        return None
+
+    return calendar.timegm((y, mo, d, h, mi, sec, 0, 0, 0))
+
+
 def parse_cd_to_unix_seconds(cd: str) -> int:
     cd = cd.strip()
+    ts = _parse_cd_fast(cd)
+    if ts is not None:
+        return ts
+
     last_err = None
     for fmt in FORMATS:
         try:
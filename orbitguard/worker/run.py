@@ -3,44 +3,76 @@ Background worker for scan jobs.
 
 What it does: 
 -- Checks the database for the oldest pending scan job
--- Claims the job by changing its status to "running" (so two workers don't do the same job)
+-- Claims the job by changing its status to "running" in one atomic UPDATE (so two workers don't do the same job)
 -- Scans all the stored ApproachEvent rows that fall within the job's time window 
 -- Flags events whose miss distance is less than or equal to threshold km and writes RiskEvent rows
 -- Stores an explanation JSON for each risk (shows why it was flagged)
 -- Marks the job as succeeded once finished, or failed if error occurs
+-- Repeats for the next pending job (up to MAX_JOBS_PER_RUN) on the same session
 
 '''
 
 
 from __future__ import annotations
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
 from orbitguard.db.database import SessionLocal
 from orbitguard.db.models import ApproachEvent, ScanJob, RiskEvent, JobStatus
-from orbitguard.core.scoring import risk_score, build_explanation_json
+from orbitguard.core.scoring import score_and_serialize
+
+# status strings resolved once instead of an enum .value lookup on every use
+_PENDING = JobStatus.PENDING.value
+_RUNNING = JobStatus.RUNNING.value
+_SUCCEEDED = JobStatus.SUCCEEDED.value
+_FAILED = JobStatus.FAILED.value
+
+# built once at import and reused for every job (executemany with a list of dicts)
+_RISK_INSERT = insert(RiskEvent.__table__)
+
+# ApproachEvents fetched per round-trip, and RiskEvent rows sent per executemany
+RISK_BATCH_SIZE = 1000
+
+# jobs run_once works through before it exits
+MAX_JOBS_PER_RUN = 100
 
 
 def claim_next_job(db: Session) -> ScanJob | None:
     """
     Find the oldest pending job and mark it as RUNNING so it won't be picked up again.
+
+    Done as a single UPDATE ... WHERE id = (oldest pending id) RETURNING, so the pick and
+    the status change are one atomic statement (two workers can't claim the same job).
+    RETURNING needs SQLite >= 3.35.
+
+    On Postgres the subquery also takes FOR UPDATE SKIP LOCKED, so concurrent workers skip
+    a row another worker is claiming and each picks a different job instead of waiting.
+    SQLite has no row locks and leaves the clause out (its writes are already serialized).
     """
-    job = (
-        db.query(ScanJob)
-        .filter(ScanJob.status == JobStatus.PENDING.value)
+    oldest_pending_id = (
+        select(ScanJob.id)
+        .where(ScanJob.status == _PENDING)
         .order_by(ScanJob.created_at.asc())
-        .first()
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
     )
-    if job is None:
-        return None
-
-    job.status = JobStatus.RUNNING.value
-    job.error = None
+    job = db.scalars(
+        update(ScanJob)
+        .where(ScanJob.id == oldest_pending_id)
+        .values(status=_RUNNING, error=None)
+        .returning(ScanJob)
+    ).first()
+    if job is not None:
+        # SQLite's RETURNING skips REAL column affinity, so a whole-number threshold comes
+        # back as an int; store the float the column actually holds (without marking it dirty)
+        set_committed_value(job, "threshold_km", float(job.threshold_km))
     db.commit()
-    db.refresh(job)
     return job
 
 
-def process_job(db: Session, job: ScanJob) -> None:
+def process_job(db: Session, job: ScanJob) -> int:
     """
     CAD-correct scan:
     - Each ApproachEvent already represents a closest-approach event at approach_ts
@@ -49,79 +81,103 @@ def process_job(db: Session, job: ScanJob) -> None:
         AND miss_distance_km <= job.threshold_km
 
     For each flagged event we create a RiskEvent (per-job result record).
-    """
-    events = (
-        db.query(ApproachEvent)
-        .filter(ApproachEvent.approach_ts >= job.start_ts)
-        .filter(ApproachEvent.approach_ts <= job.end_ts)
-        .all()
-    )
+    Both conditions are in the query, so only flagged events come back from the database.
 
-    for ev in events:
-        dmin = ev.miss_distance_km
-        tca_ts = ev.approach_ts
-
-        if dmin <= job.threshold_km:
-            score = risk_score(job.threshold_km, dmin)
-
-            expl = build_explanation_json(
-                object_id=ev.object_id,
-                epoch_ts=ev.approach_ts,   # for CAD, epoch == approach time
-                start_ts=job.start_ts,
-                end_ts=job.end_ts,
-                threshold_km=job.threshold_km,
-                tca_ts=tca_ts,
-                min_distance_km=dmin,
-                score=score,
-            )
-
-            risk = RiskEvent(
-                job_id=job.id,
-                object_id=ev.object_id,
-                min_distance_km=dmin,
-                tca_ts=tca_ts,
-                risk_score=score,
-                explanation_json=expl,
-            )
-            db.add(risk)
-
-    # Commit once at the end (faster + cleaner than committing per row)
-    db.commit()
+    Events are streamed RISK_BATCH_SIZE at a time and results are inserted every
+    RISK_BATCH_SIZE rows, so memory stays bounded by the batch size, not the window.
+    Only the three columns used are selected, as plain tuples (no ORM objects or identity map).
 
+    Does not commit: run_once commits the results together with the job's status change.
+    Returns the number of RiskEvents inserted (counted from the batches, no COUNT query).
+    """
+    # plain locals for the loop (job attributes go through ORM instrumentation on every read)
+    job_id = job.id
+    start_ts = job.start_ts
+    end_ts = job.end_ts
+    threshold_km = job.threshold_km
+
+    events = db.execute(
+        select(ApproachEvent.object_id, ApproachEvent.approach_ts, ApproachEvent.miss_distance_km)
+        .where(ApproachEvent.approach_ts.between(start_ts, end_ts))
+        .where(ApproachEvent.miss_distance_km <= threshold_km)
+        .execution_options(yield_per=RISK_BATCH_SIZE)
+    )
 
-def run_once() -> None:
+    inserted = 0
+    risk_rows: list[dict] = []
+    for object_id, tca_ts, dmin in events:
+        score, expl = score_and_serialize(
+            threshold_km=threshold_km,
+            min_distance_km=dmin,
+            object_id=object_id,
+            epoch_ts=tca_ts,   # for CAD, epoch == approach time
+            start_ts=start_ts,
+            end_ts=end_ts,
+            tca_ts=tca_ts,
+        )
+
+        risk_rows.append(
+            {
+                "job_id": job_id,
+                "object_id": object_id,
+                "min_distance_km": dmin,
+                "tca_ts": tca_ts,
+                "risk_score": score,
+                "explanation_json": expl,
+            }
+        )
+        if len(risk_rows) >= RISK_BATCH_SIZE:
+            db.execute(_RISK_INSERT, risk_rows)
+            inserted += len(risk_rows)
+            risk_rows = []
+
+    # Results go in with Core executemany per batch (no ORM objects or unit-of-work bookkeeping)
+    if risk_rows:
+        db.execute(_RISK_INSERT, risk_rows)
+        inserted += len(risk_rows)
+    return inserted
+
+
+def run_once(max_jobs: int = MAX_JOBS_PER_RUN) -> None:
     """
-    Runs a single job and then exits.
+    Runs pending jobs (oldest first) until none are left or max_jobs have run, then exits.
+    All jobs share one session. Stops after a failed job, so its retry happens on a later run
+    instead of straight away.
     """
     db = SessionLocal()
     try:
-        job = claim_next_job(db)
-        if job is None:
-            print("No pending jobs.")
-            return
-
-        print(f"Running job {job.id} window=({job.start_ts}, {job.end_ts}) threshold={job.threshold_km} km")
-        try:
-            process_job(db, job)
-            job.status = JobStatus.SUCCEEDED.value
-            db.commit()
-            print(f"Job {job.id} succeeded.")
-        except Exception as e:
-            db.rollback()
-            job.attempts += 1
-            job.error = str(e)
-
-            if job.attempts < job.max_attempts:
-                job.status = JobStatus.PENDING.value
-                print(
-                    f"Job {job.id} failed; retrying later "
-                    f"(attempt {job.attempts}/{job.max_attempts}). Error: {e}"
-                )
-            else:
-                job.status = JobStatus.FAILED.value
-                print(f"Job {job.id} failed permanently. Error: {e}")
-
-            db.commit()
+        for ran in range(max_jobs):
+            job = claim_next_job(db)
+            if job is None:
+                if ran == 0:
+                    print("No pending jobs.")
+                return
+
+            print(f"Running job {job.id} window=({job.start_ts}, {job.end_ts}) threshold={job.threshold_km} km")
+            try:
+                # one transaction for the job: its RiskEvents and SUCCEEDED land together or not
+                # at all (begin() commits on exit and rolls back if process_job raises)
+                with db.begin():
+                    flagged = process_job(db, job)
+                    job.status = _SUCCEEDED
+                print(f"Job {job.id} succeeded ({flagged} risks flagged).")
+            except Exception as e:
+                db.rollback()
+                job.attempts += 1
+                job.error = str(e)
+
+                if job.attempts < job.max_attempts:
+                    job.status = _PENDING
+                    print(
+                        f"Job {job.id} failed; retrying later "
+                        f"(attempt {job.attempts}/{job.max_attempts}). Error: {e}"
+                    )
+                else:
+                    job.status = _FAILED
+                    print(f"Job {job.id} failed permanently. Error: {e}")
+
+                db.commit()
+                return
     finally:
         db.close()
 
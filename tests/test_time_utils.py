@@ -0,0 +1,55 @@
+import pytest
+
+from orbitguard.api.time_utils import _str_to_unix_seconds, to_unix_seconds
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("2026-01-15T12:00:00Z", 1768478400),
+        ("2026-01-15T12:00:00.000Z", 1768478400),
+        ("2026-01-15T12:00:00.123Z", 1768478400),
+        ("2026-01-15T12:00:00+00:00", 1768478400),
+    ],
+)
+def test_iso_strings(value, expected):
+    assert to_unix_seconds(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "2026-+1-15T12:00:00Z",       # sign inside a field
+        "2026-01-15T 1:00:00Z",       # space inside a field
+        "2026-01-15T12:00:00.1²3Z",   # non-ASCII digit in the millis
+        "2026-02-30T12:00:00Z",       # no such day
+    ],
+)
+def test_malformed_iso_strings_rejected(value):
+    with pytest.raises(ValueError):
+        to_unix_seconds(value)
+
+
+def test_unix_seconds_string():
+    assert to_unix_seconds("1766638719") == 1766638719
+    assert to_unix_seconds(" 1766638719 ") == 1766638719
+
+
+@pytest.mark.parametrize("value", ["1_000", "+5", "-5", "١٢٣"])
+def test_non_digit_unix_strings_rejected(value):
+    with pytest.raises(ValueError):
+        to_unix_seconds(value)
+
+
+def test_padded_strings_not_cached_with_their_padding():
+    _str_to_unix_seconds.cache_clear()
+    assert to_unix_seconds(" " * 1_000_000 + "5") == 5
+    assert to_unix_seconds(" " * 1_000_000 + "2026-01-15T12:00:00Z") == 1768478400
+    assert to_unix_seconds("0" * 1000 + "5") == 5  # long even after stripping: not cached
+
+    # only the two stripped values were stored: looking them up again is all hits
+    assert _str_to_unix_seconds.cache_info().currsize == 2
+    _str_to_unix_seconds("5")
+    _str_to_unix_seconds("2026-01-15T12:00:00Z")
+    info = _str_to_unix_seconds.cache_info()
+    assert (info.hits, info.currsize) == (2, 2)